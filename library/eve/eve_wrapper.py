@@ -113,7 +113,10 @@ class EveWrapper():
                 
             ByteArray512 = ctypes.c_byte * 512
             encoded = os.path.dirname(eve_sdk_path).encode('utf-8')
-            pathOverride = ByteArray512(*encoded, *([0] * (512 - len(encoded))))  # zero-pad to 512
+            if len(encoded) >= 512:
+                # Leave room for the NUL terminator the SDK reads up to
+                raise RuntimeError(f"EVE SDK path is {len(encoded)} bytes, at most 511 are supported: {os.path.dirname(eve_sdk_path)}")
+            pathOverride = ByteArray512.from_buffer_copy(encoded.ljust(512, b'\0'))  # zero-pad to 512
 
             startup_options = sdk.structs.EveStartupParameters(pathOverride=pathOverride, gpuPreference=sdk.structs.EveGpuPreference.EVE_NO_GPU)
             err = eve_sdk.CreateEve(startup_options)
@@ -130,8 +133,9 @@ class EveWrapper():
                 if cameraInfo.error == sdk.structs.EveError.EVE_INVALID_CAMERA_ID or cameraInfo.error == sdk.structs.EveError.EVE_NO_MORE_DATA:
                     break
             
-                pid = ctypes.cast(cameraInfo.data.pid, ctypes.c_char_p).value
-                vid = ctypes.cast(cameraInfo.data.vid, ctypes.c_char_p).value
+                # Bounded reads: pid/vid are fixed 8-byte fields that need not be NUL terminated
+                pid = bytes(cameraInfo.data.pid).split(b'\0', 1)[0]
+                vid = bytes(cameraInfo.data.vid).split(b'\0', 1)[0]
                 if cameraInfo.data.isFpgaCamera == 1:
                     if self._metaDataFpgaCameraId == -1 and vid == b'META' and pid == b'DATA':
                         self._metaDataFpgaCameraId = i
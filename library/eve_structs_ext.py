@@ -0,0 +1,193 @@
+"""
+Fast-path helpers for reading EVE SDK ctypes structures.
+The structs under eve/eve_python/structs are generated from the C headers, so these
+helpers work on top of them without modifying the generated files.
+"""
+
+import ctypes
+import struct
+import functools
+from collections import namedtuple
+
+import numpy as np
+
+from eve.eve_python import eve_sdk as sdk
+
+# NumPy equivalents of the generated structs, for column-wise access to detection arrays
+STATIC_GESTURE_DTYPE = np.dtype(sdk.structs.EveStaticGesture)
+DYNAMIC_GESTURE_DTYPE = np.dtype(sdk.structs.EveDynamicGesture)
+
+# Plain dict lookups for the gesture enums, cheaper than going through the enum metaclass
+STATIC_GESTURE_NAME_TO_INT = {m.name: int(m) for m in sdk.structs.EveStaticGestureType}
+STATIC_GESTURE_INT_TO_NAME = {v: k for k, v in STATIC_GESTURE_NAME_TO_INT.items()}
+DYNAMIC_GESTURE_NAME_TO_INT = {m.name: int(m) for m in sdk.structs.EveDynamicGestureType}
+DYNAMIC_GESTURE_INT_TO_NAME = {v: k for k, v in DYNAMIC_GESTURE_NAME_TO_INT.items()}
+
+
+def _flatten(cls, base=0):
+    """Yield (offset, struct code) for every scalar inside a ctypes type"""
+    if issubclass(cls, ctypes.Structure):
+        for field in cls._fields_:
+            name, field_type = field[0], field[1]
+            yield from _flatten(field_type, base + getattr(cls, name).offset)
+    elif issubclass(cls, ctypes.Array):
+        size = ctypes.sizeof(cls._type_)
+        for i in range(cls._length_):
+            yield from _flatten(cls._type_, base + i * size)
+    else:
+        yield base, cls._type_
+
+
+@functools.lru_cache(maxsize=None)
+def _fastview(cls):
+    """
+    Build a precompiled reader for a ctypes structure.
+    Returns (struct.Struct, record type, keys) where keys index the flat unpacked
+    tuple: an int for scalar fields, a slice for nested structs and arrays.
+    """
+    fmt = "@"
+    pos = 0
+    for offset, code in _flatten(cls):
+        if offset > pos:
+            fmt += f"{offset - pos}x"
+        fmt += code
+        pos = offset + struct.calcsize("@" + code)
+    if ctypes.sizeof(cls) > pos:
+        fmt += f"{ctypes.sizeof(cls) - pos}x"
+    compiled = struct.Struct(fmt)
+    if compiled.size != ctypes.sizeof(cls):
+        raise TypeError(f"{cls.__name__}: layout {fmt} does not match ctypes size {ctypes.sizeof(cls)}")
+
+    keys = []
+    index = 0
+    for field in cls._fields_:
+        field_type = field[1]
+        count = sum(1 for _ in _flatten(field_type))
+        if issubclass(field_type, (ctypes.Structure, ctypes.Array)):
+            keys.append(slice(index, index + count))
+        else:
+            keys.append(index)
+        index += count
+    record = namedtuple(cls.__name__, [field[0] for field in cls._fields_], rename=True)
+    return compiled, record, tuple(keys)
+
+
+def parse_hand_detections(buf, offset=0):
+    """
+    Parse a raw EveHandDetections from any buffer (bytes, memoryview, or
+    ctypes.string_at() of the pointer in EveHandGestureData) without building ctypes objects.
+    Returns an EveHandDetections named tuple whose hands field holds only the
+    detected hands, each as the record yielded by iter_hands_fast().
+    """
+    compiled, record, keys = _fastview(sdk.structs.EveHandDetections)
+    _, hand_record, hand_keys = _fastview(sdk.structs.EveSingleHandDetection)
+    flat = compiled.unpack_from(buf, offset)
+    detections = record._make([flat[key] for key in keys])
+
+    hands_flat = detections.hands
+    per_hand = len(hands_flat) // sdk.structs.EVE_MAX_HAND_DETECTIONS
+    count = min(detections.detectedHandCount, sdk.structs.EVE_MAX_HAND_DETECTIONS)
+    hands = []
+    for i in range(count):
+        values = hands_flat[i * per_hand:(i + 1) * per_hand]
+        hands.append(hand_record._make([values[key] for key in hand_keys]))
+    return detections._replace(hands=hands)
+
+
+def iter_hands_fast(detections):
+    """
+    Yield the detected hands of an EveHandDetections as plain named tuples.
+    Nested fields come back flattened: boundingBox is (x, y, width, height) and
+    landmarksICS is (x0, y0, x1, y1, ...).
+    The structure is copied once up front, so later SDK writes don't affect the iteration.
+    """
+    raw = ctypes.string_at(ctypes.addressof(detections), ctypes.sizeof(detections))
+    yield from parse_hand_detections(raw).hands
+
+
+def landmarks_array(detections):
+    """
+    Return the landmarks of the detected hands in an EveHandDetections as a
+    float32 array of shape (detectedHandCount, EVE_HAND_LANDMARK_SIZE, 2), so geometry
+    can be computed with vectorized NumPy (np.hypot, np.arctan2, ...) instead of per-point loops.
+    The array aliases the ctypes memory without copying and is only valid until the
+    struct is overwritten, e.g. by the next EveWrapperExt.get_hand_detections() call.
+    """
+    hand = sdk.structs.EveSingleHandDetection
+    count = min(detections.detectedHandCount, sdk.structs.EVE_MAX_HAND_DETECTIONS)
+    return np.ndarray(
+        shape=(count, sdk.structs.EVE_HAND_LANDMARK_SIZE, 2),
+        dtype=np.float32,
+        buffer=detections,
+        offset=type(detections).hands.offset + hand.landmarksICS.offset,
+        strides=(ctypes.sizeof(hand), ctypes.sizeof(sdk.structs.CPoint2f), ctypes.sizeof(ctypes.c_float)),
+    )
+
+
+def gestures_array(gestures):
+    """
+    Return the valid entries of an EveStaticGestures or EveDynamicGestures as a
+    NumPy structured array, so callers can do e.g. arr["confidence"].mean().
+    The array aliases the ctypes memory: copy it if it has to outlive the struct.
+    """
+    count = min(gestures.count, len(gestures.gestures))
+    return np.ctypeslib.as_array(gestures.gestures)[:count]
+
+
+def _c_string(struct_obj, field):
+    """Read a fixed-size byte array field as bytes, stopping at the first NUL"""
+    descriptor = getattr(type(struct_obj), field)
+    # A c_char view over the same memory gets ctypes' single-memcpy string getter
+    return (ctypes.c_char * descriptor.size).from_buffer(struct_obj, descriptor.offset).value
+
+
+def camera_strings(camera):
+    """Return the (pid, vid, name) of a CCamera as bytes"""
+    return _c_string(camera, "pid"), _c_string(camera, "vid"), _c_string(camera, "name")
+
+
+# Compiled C layout of CCameraFormat, shared by the pack/unpack helpers below
+_CAMERA_FORMAT_STRUCT = _fastview(sdk.structs.CCameraFormat)[0]
+
+
+def pack_camera_format(width, height, format, fps, compare_resolution, compare_fps):
+    """Pack CCameraFormat fields straight to bytes in the C layout, without a ctypes object"""
+    return _CAMERA_FORMAT_STRUCT.pack(width, height, format, fps, compare_resolution, compare_fps)
+
+
+def unpack_camera_format(buf, offset=0):
+    """Unpack a CCameraFormat from a buffer as (width, height, format, fps, compareResolution, compareFps)"""
+    return _CAMERA_FORMAT_STRUCT.unpack_from(buf, offset)
+
+
+def unpack_camera_format_into(fmt, buf, offset=0):
+    """Overwrite an existing CCameraFormat with the bytes at buf[offset:] in one copy"""
+    memoryview(fmt).cast("B")[:] = memoryview(buf).cast("B")[offset:offset + _CAMERA_FORMAT_STRUCT.size]
+    return fmt
+
+
+def struct_from_buffer(cls, buf, offset=0):
+    """
+    Map a ctypes structure onto an existing buffer.
+    Writable buffers (bytearray, writable memoryview, mmap) are shared without a copy;
+    read-only ones such as bytes fall back to a single copy.
+    """
+    try:
+        return cls.from_buffer(buf, offset)
+    except TypeError:
+        return cls.from_buffer_copy(buf, offset)
+
+
+def _check_packed(cls):
+    """Raise if a structure relies on implicit padding between or after its fields"""
+    used = sum(struct.calcsize("@" + code) for _, code in _flatten(cls))
+    if used != ctypes.sizeof(cls):
+        raise TypeError(f"{cls.__name__}: {ctypes.sizeof(cls) - used} padding bytes, layout may differ from the packed C struct")
+
+
+# These are read through the fast paths above. Every field is 4 bytes wide, so the
+# natural ctypes layout equals the C build's; fail early if a regenerated struct changes that.
+for _cls in (sdk.structs.CCameraFormat, sdk.structs.EveStaticGesture, sdk.structs.EveDynamicGesture,
+             sdk.structs.EveSingleHandDetection, sdk.structs.EveHandDetections):
+    _check_packed(_cls)
+del _cls
@@ -3,44 +3,207 @@ Extended EVE Wrapper with additional functionality for FPGA state management.
 This class inherits from the EVE library's EveWrapper without modifying the library itself.
 """
 
-import sys
-import os
+import ctypes
+import threading
+from dataclasses import dataclass
+from typing import NamedTuple, Optional
 
-# Add the library path to sys.path
-sys.path.append(os.path.join(os.path.dirname(__file__), 'library'))
+import numpy as np
 
+import eve.eve_wrapper as eve_wrapper
 from eve.eve_wrapper import EveWrapper
 from eve.eve_python import eve_sdk as sdk
 
 
+# Resolve the ctypes enums once so getFpgaState works on plain int keys
+_CS_ENABLED = int(sdk.structs.setting_type_t.CS_ENABLED)
+_CS_IPS = int(sdk.structs.setting_type_t.CS_IPS)
+
+# Feature name per pipeline type, indexed by the enum's int value (None for unused types)
+_FEATURE_NAMES = [None] * int(sdk.structs.pipeline_config_type_t.PT_SIZE)
+_FEATURE_NAMES[sdk.structs.pipeline_config_type_t.PT_FD] = "face_detection"
+_FEATURE_NAMES[sdk.structs.pipeline_config_type_t.PT_LM_FV] = "face_validation"
+_FEATURE_NAMES[sdk.structs.pipeline_config_type_t.PT_FID] = "face_id"
+_FEATURE_NAMES[sdk.structs.pipeline_config_type_t.PT_PD] = "person_detection"
+_FEATURE_NAMES[sdk.structs.pipeline_config_type_t.PT_HD] = "hand_landmarks"
+_FEATURE_NAMES = tuple(_FEATURE_NAMES)
+
+
+class FeatureState(NamedTuple):
+    """State of a single FPGA feature"""
+    enabled: bool
+    max_ips: Optional[int]
+
+
+@dataclass(frozen=True)
+class FpgaState:
+    """FPGA state per feature, None for features the FPGA hasn't reported"""
+    __slots__ = ("face_detection", "face_validation", "face_id", "person_detection", "hand_landmarks")
+    face_detection: Optional[FeatureState]
+    face_validation: Optional[FeatureState]
+    face_id: Optional[FeatureState]
+    person_detection: Optional[FeatureState]
+    hand_landmarks: Optional[FeatureState]
+
+    def items(self):
+        """Yield (feature name, FeatureState) for the reported features"""
+        for name in self.__slots__:
+            state = getattr(self, name)
+            if state is not None:
+                yield name, state
+
+    def to_dict(self):
+        """
+        Return the state in the dict layout getFpgaState() used to return:
+        {feature name: {"enabled": bool, "max_ips": int}} for the reported features only,
+        with "max_ips" left out when the FPGA didn't report it.
+        """
+        features_state = {}
+        for name, state in self.items():
+            features_state[name] = {"enabled": state.enabled}
+            if state.max_ips is not None:
+                features_state[name]["max_ips"] = state.max_ips
+        return features_state
+
+
+class FrameSnapshot(NamedTuple):
+    """Metadata and image of one processed frame, published together by the SDK callback"""
+    frame_id: int
+    metadata: Optional[dict]
+    raw_metadata: Optional[bytes]
+    image: object
+    image_jpg: Optional[bytes]
+
+
+class WrapperStatus(NamedTuple):
+    """Frame counter and mode flags of the wrapper"""
+    frame_id: int
+    fpga: bool
+    metadata: bool
+    ulp: bool
+
+
 class EveWrapperExt(EveWrapper):
     """Extended EVE Wrapper with additional helper methods"""
     
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Reused by get_hand_detections() so reading a frame doesn't allocate the nested structs
+        self._hand_detections_buf = sdk.structs.EveHandDetections()
+        self._jsonRaw = None
+        self._snapshot = FrameSnapshot(0, None, None, None, None)
+        self._frame_ready = threading.Condition()
+    
+    def eve_callback(self, return_data):
+        json_before = self._json
+        super().eve_callback(return_data)
+        # Keep the raw text of the frame that get_json() returns, failed reads don't replace it
+        if self._json is not json_before:
+            self._jsonRaw = self._jsonStr
+        if self._frame_id != self._snapshot.frame_id:
+            # Swapped in with a single assignment, so readers never see a half-updated frame
+            with self._frame_ready:
+                self._snapshot = FrameSnapshot(self._frame_id, self._json, self._jsonRaw, self._imageClone, self._image)
+                self._frame_ready.notify_all()
+    
+    def get_frame_snapshot(self):
+        """
+        Get the latest published frame as a FrameSnapshot.
+        Unlike separate get_json()/get_image() calls, the metadata and images are
+        guaranteed to come from the same callback. Never blocks.
+        """
+        return self._snapshot
+    
+    def wait_for_next_frame(self, timeout=None):
+        """
+        Wait until the SDK callback publishes a frame newer than the current one,
+        or until timeout seconds have passed, then return the latest FrameSnapshot.
+        Returns as soon as the frame arrives instead of sleeping for a fixed time.
+        """
+        frame_id = self._snapshot.frame_id
+        with self._frame_ready:
+            self._frame_ready.wait_for(lambda: self._snapshot.frame_id != frame_id, timeout)
+        return self._snapshot
+    
+    def get_image_into(self, out):
+        """
+        Copy the image of the latest published frame into a caller-owned uint8 array,
+        e.g. one np.empty((max_height, max_width, 3), np.uint8) allocated once and
+        reused, for callers that keep an image across frames.
+        The channel count must match the frame's: grey frames are (height, width, 1).
+        Returns the out[:height, :width] view that was written, or None if there is no image.
+        Raises ValueError if out is not uint8, has a different channel layout, or is too small.
+        """
+        image = self._snapshot.image
+        if image is None:
+            return None
+        # np.copyto would broadcast e.g. a grey (h, w, 1) frame into a 3-channel buffer, so check explicitly
+        if out.dtype != np.uint8 or out.shape[2:] != image.shape[2:]:
+            raise ValueError(f"out must be a uint8 array with channel shape {image.shape[2:]}, got {out.dtype} {out.shape}")
+        height, width = image.shape[:2]
+        if out.shape[0] < height or out.shape[1] < width:
+            raise ValueError(f"out {out.shape} is too small for a {height}x{width} image")
+        view = out[:height, :width]
+        np.copyto(view, image)
+        return view
+    
+    def get_raw_metadata(self):
+        """
+        Get the metadata returned by get_json() as the raw JSON bytes received from the FPGA,
+        so it can be written out without a decode/encode round-trip.
+        Returns None if no metadata has been received yet.
+        """
+        return self._jsonRaw
+    
+    def configureFpgaDelta(self, feats, changed):
+        """
+        Like configureFpga(), but only sends the settings of the features named in
+        `changed` instead of re-sending every feature in `feats`.
+        """
+        return self.configureFpga({featureName: feats[featureName] for featureName in changed if featureName in feats})
+    
+    def get_status_snapshot(self):
+        """
+        Get the frame id and the isFpgaEnabled()/isUsingMetadata()/isUlpEnabled() flags
+        as one WrapperStatus, read in a single call.
+        The getters are plain attribute reads, so this doesn't touch the SDK or the bus.
+        """
+        return WrapperStatus(
+            self.get_frame_id(),
+            self.isFpgaEnabled(),
+            self.isUsingMetadata(),
+            self.isUlpEnabled(),
+        )
+    
+    def get_hand_detections(self):
+        """
+        Copy the SDK's current hand detections into a buffer owned by the wrapper.
+        The returned EveHandDetections is the same object on every call and is
+        overwritten by the next one: don't keep references to it across frames,
+        copy out the values that are needed instead.
+        Returns None if the SDK has no hand data.
+        """
+        if not eve_wrapper.eve_sdk:
+            raise RuntimeError(f"Eve SDK not initialized")
+        data = eve_wrapper.eve_sdk.EveGetHandGestureData()
+        if data.errorCode != sdk.structs.EveError.EVE_ERROR_NO_ERROR or not data.hands:
+            return None
+        buf = self._hand_detections_buf
+        ctypes.memmove(ctypes.addressof(buf), data.hands, ctypes.sizeof(buf))
+        return buf
+    
     def getFpgaState(self):
         """
         Get the current FPGA state in a user-friendly format.
-        Returns a dictionary mapping feature names to their enabled state and settings.
-        """
-        # Map pipeline types to feature names
-        type_to_feature = {
-            sdk.structs.pipeline_config_type_t.PT_FD: "face_detection",
-            sdk.structs.pipeline_config_type_t.PT_LM_FV: "face_validation",
-            sdk.structs.pipeline_config_type_t.PT_FID: "face_id",
-            sdk.structs.pipeline_config_type_t.PT_PD: "person_detection",
-            sdk.structs.pipeline_config_type_t.PT_HD: "hand_landmarks",
-        }
-        
-        features_state = {}
-        
-        for pipeline_type, feature_name in type_to_feature.items():
-            if pipeline_type in self._fpgaState:
-                feature_settings = self._fpgaState[pipeline_type]
-                enabled_value = feature_settings.get(sdk.structs.setting_type_t.CS_ENABLED, 0)
-                features_state[feature_name] = {
-                    "enabled": bool(enabled_value)
-                }
-                # Add IPS if available
-                if sdk.structs.setting_type_t.CS_IPS in feature_settings:
-                    features_state[feature_name]["max_ips"] = feature_settings[sdk.structs.setting_type_t.CS_IPS]
+        Returns an immutable FpgaState holding a FeatureState (enabled, max_ips) per
+        reported feature and None for the others; use its to_dict() for the previous
+        {"enabled", "max_ips"} dict layout.
+        """
+        states = dict.fromkeys(FpgaState.__slots__)
+        for pipeline_type, feature_settings in self._fpgaState.items():
+            feature_name = _FEATURE_NAMES[pipeline_type]
+            if feature_name is None:
+                continue
+            states[feature_name] = FeatureState(bool(feature_settings.get(_CS_ENABLED, 0)), feature_settings.get(_CS_IPS))
         
-        return features_state
+        return FpgaState(**states)
@@ -40,29 +40,342 @@ USAGE:
 
 import time
 import json
-import cv2
 import os
 import sys
-import yaml
+import copy
+import functools
 from pathlib import Path
+from importlib.util import find_spec
 from datetime import datetime
+from types import MappingProxyType
+from concurrent.futures import ThreadPoolExecutor
 
 # Add the library path to sys.path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'library'))
 
-from eve_wrapper_ext import EveWrapperExt
+# Heavy and optional modules are loaded on first use, keeping them off the path to test_prerequisites().
+# (eve.eve_wrapper imports cv2 itself, so OpenCV is loaded anyway once the SDK is initialised.)
+@functools.lru_cache(maxsize=None)
+def _cv2():
+    """Import OpenCV on first use"""
+    import cv2
+    return cv2
+
+
+@functools.lru_cache(maxsize=None)
+def _yaml():
+    """Import PyYAML on first use, returning (yaml, loader, dumper)"""
+    import yaml
+    # Prefer the libyaml C loader/dumper, fall back to the pure-Python ones if it isn't compiled in
+    try:
+        from yaml import CSafeLoader as loader, CSafeDumper as dumper
+    except ImportError:
+        from yaml import SafeLoader as loader, SafeDumper as dumper
+    return yaml, loader, dumper
+
+
+@functools.lru_cache(maxsize=None)
+def _turbojpeg():
+    """
+    Load PyTurboJPEG and its libturbojpeg shared library on first use (libjpeg-turbo SIMD encoder).
+    Returns (TurboJPEG instance, TJSAMP_420, whether encode() takes a dst buffer), or None if unavailable.
+    """
+    try:
+        from turbojpeg import TurboJPEG, TJSAMP_420
+        tj = TurboJPEG()
+    except (ImportError, OSError, RuntimeError):
+        return None
+    import inspect
+    # Newer PyTurboJPEG releases can encode into a caller-provided buffer (TurboJPEG.encode(dst=...))
+    return tj, TJSAMP_420, 'dst' in inspect.signature(tj.encode).parameters
+
+
+@functools.lru_cache(maxsize=None)
+def _simplejpeg():
+    """Import simplejpeg on first use (bundles its own libjpeg-turbo), or return None if it isn't installed"""
+    try:
+        import simplejpeg
+    except ImportError:
+        return None
+    return simplejpeg
+
+
+@functools.lru_cache(maxsize=None)
+def _orjson():
+    """Import orjson on first use (Rust-backed JSON encoder), or return None so stdlib json is used"""
+    try:
+        import orjson
+    except ImportError:
+        return None
+    return orjson
+
+
+@functools.lru_cache(maxsize=1)
+def _parse_config(path, mtime):
+    """Parse a YAML config file; the mtime argument invalidates the cache when the file changes"""
+    yaml, loader, _ = _yaml()
+    with open(path, 'rb') as f:
+        return yaml.load(f, Loader=loader)
+
+
+def _load_config(path="config.yaml"):
+    """Load a YAML config file, reusing the last parse while the file is unchanged"""
+    # Callers mutate the result, so never hand out the cached dict itself
+    return copy.deepcopy(_parse_config(path, os.path.getmtime(path)))
+
+
+# Marker comments around the features block in config.yaml
+_FEATURES_BEGIN = "# BEGIN features"
+_FEATURES_END = "# END features"
+
+
+def _save_features(path, features):
+    """Write the features section to a YAML config file, leaving the rest of the file untouched"""
+    yaml, _, dumper = _yaml()
+    text = Path(path).read_text()
+    block = yaml.dump({'features': features}, Dumper=dumper, default_flow_style=False, indent=2)
+    
+    begin = text.find(_FEATURES_BEGIN)
+    end = text.find(_FEATURES_END, begin) if begin >= 0 else -1
+    if end >= 0:
+        # Splice the new block in between the marker lines
+        start = text.index("\n", begin) + 1
+        text = text[:start] + block + text[end:]
+    else:
+        # No markers yet: rewrite the whole file once and add them
+        config = _load_config(path)
+        config.pop('features', None)
+        text = yaml.dump(config, Dumper=dumper, default_flow_style=False, indent=2)
+        text += f"\n{_FEATURES_BEGIN}\n{block}{_FEATURES_END}\n"
+    Path(path).write_text(text)
+
+
+# Output buffer reused by _encode_jpeg_turbo() between captures
+_jpeg_buf = bytearray()
+
+
+def _jpeg_buf_size(width, height):
+    """Worst-case 4:2:0 JPEG size, the same bound libjpeg-turbo's tjBufSize() uses"""
+    return ((width + 15) // 16 * 16) * ((height + 15) // 16 * 16) * 3 + 2048
+
+
+def _reserve_jpeg_buf(size):
+    """Grow the reused JPEG output buffer to at least size bytes"""
+    global _jpeg_buf
+    if len(_jpeg_buf) < size:
+        _jpeg_buf = bytearray(size)
+
+
+def _encode_jpeg_turbo(turbojpeg, image_array):
+    """Encode a BGR image with PyTurboJPEG, reusing one output buffer between captures when supported"""
+    tj, subsample, supports_dst = turbojpeg
+    if not supports_dst:
+        return tj.encode(image_array, quality=85, jpeg_subsample=subsample)
+    
+    height, width = image_array.shape[:2]
+    _reserve_jpeg_buf(_jpeg_buf_size(width, height))
+    _, size = tj.encode(image_array, quality=85, jpeg_subsample=subsample, dst=_jpeg_buf)
+    return memoryview(_jpeg_buf)[:size]
+
+
+def _encode_jpeg(image_array):
+    """Encode a BGR or single-channel image as a quality 85 JPEG with the fastest encoder available"""
+    # The libjpeg-turbo encoders are set up for 3-channel BGR; grey (h, w, 1) frames go to OpenCV
+    is_bgr = image_array.ndim == 3 and image_array.shape[2] == 3
+    if is_bgr:
+        turbojpeg = _turbojpeg()
+        if turbojpeg is not None:
+            return _encode_jpeg_turbo(turbojpeg, image_array)
+        simplejpeg = _simplejpeg()
+        if simplejpeg is not None:
+            return simplejpeg.encode_jpeg(image_array, quality=85, colorspace='BGR', colorsubsampling='420', fastdct=True)
+    cv2 = _cv2()
+    ok, jpg = cv2.imencode('.jpg', image_array, [int(cv2.IMWRITE_JPEG_QUALITY), 85])
+    if not ok:
+        raise RuntimeError("JPEG encoding failed")
+    return jpg
+
+
+def _warm_up_jpeg_encoder(max_width):
+    """
+    Load and initialise the JPEG encoder with one tiny encode, and size PyTurboJPEG's reused
+    output buffer for frames up to max_width x max_width (the wrapper scales frames down to
+    max_width, so any landscape frame fits), so the first capture pays for neither.
+    """
+    import numpy as np
+    _encode_jpeg(np.zeros((16, 16, 3), np.uint8))
+    turbojpeg = _turbojpeg()
+    if turbojpeg is not None and turbojpeg[2] and max_width > 0:
+        _reserve_jpeg_buf(_jpeg_buf_size(max_width, max_width))
+
+
+def _write_file(filename, data, sync=False):
+    """
+    Write a whole buffer (bytes, or a contiguous array such as cv2.imencode output) with unbuffered os.write calls.
+    The data goes to a temporary file that then replaces `filename`, so readers see either the
+    previous file or the complete new one, never a partial write.
+    With sync set the file is opened with O_DSYNC and, on POSIX systems, the directory is
+    fsynced after the rename, so both the data and the new name are on disk when this returns.
+    """
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC
+    if sync:
+        flags |= getattr(os, 'O_DSYNC', 0)
+    tmp_name = f"{filename}.tmp"
+    fd = os.open(tmp_name, flags, 0o644)
+    try:
+        try:
+            view = memoryview(data).cast("B")
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+        os.replace(tmp_name, filename)
+        if sync and hasattr(os, 'O_DIRECTORY'):
+            # O_DSYNC only covers the data; the rename is durable once the directory is flushed too
+            dir_fd = os.open(os.path.dirname(os.path.abspath(filename)), os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+# EveWrapperExt keyword argument -> (config.yaml section, key, default)
+_WRAPPER_PARAMS = {
+    'comport': ('eve', 'comport', 0),
+    'i2cAdapter': ('i2c', 'bus', 0),
+    'i2cDevice': ('i2c', 'device_address', 0x30),
+    'i2cIRQ': ('i2c', 'irq_pin', 26),
+    'pipelineVersion': ('eve', 'pipeline_version', 0),
+    'evePath': ('eve', 'eve_path', '/opt/EVE-6.7.21-Source/bin'),
+    'toJpg': ('eve', 'to_jpg', True),
+    'copyImage': ('eve', 'copy_image', True),  # Enable image copying for capture
+    'maxWidth': ('eve', 'max_width', 800),
+    'driverPath': ('eve', 'driver_path', '/home/lattice/mY_Work/eve-cam/clnx_camDrvEn'),
+    'objectDetection': ('eve', 'object_detection', False),
+}
+
+# Known feature keys and their display names
+_FEATURE_KEYS = (
+    'face_detection',
+    'face_validation',
+    'person_detection',
+    'hand_landmarks',
+    'face_id',
+    'face_id_multi',
+    'object_detection',
+)
+_PRETTY = {feature_key: feature_key.replace('_', ' ').title() for feature_key in _FEATURE_KEYS}
+
+
+def _feature_title(feature_key):
+    """Display name of a feature key"""
+    title = _PRETTY.get(feature_key)
+    return title if title is not None else feature_key.replace('_', ' ').title()
+
+
+# Static menu text, built once and written with a single sys.stdout.write()
+_MAIN_MENU = (
+    "\n" + "=" * 50 + "\n"
+    "📋 INTERACTIVE MENU\n"
+    + "=" * 50 + "\n"
+    "Commands:\n"
+    "  'c' - Capture frame (image + metadata)\n"
+    "  'm' - Capture metadata only\n"
+    "  'i' - Capture image only\n"
+    "  's' - Settings/Configuration mode\n"
+    "  'f' - Face ID Registration mode\n"
+    "  'u' - Toggle ULP mode\n"
+    "  'x' - Exit program\n"
+    + "=" * 50 + "\n"
+)
+
+_CONFIG_MENU_HEADER = (
+    "\n" + "=" * 60 + "\n"
+    "⚙️  CONFIGURATION MODE\n"
+    + "=" * 60 + "\n"
+    "Current Feature Settings:\n"
+)
+
+_CONFIG_MENU_FOOTER = (
+    "\nConfiguration Options:\n"
+    "  '1' - Toggle Face Detection\n"
+    "  '2' - Toggle Face Validation\n"
+    "  '3' - Toggle Person Detection\n"
+    "  '4' - Toggle Hand Landmarks\n"
+    "  '5' - Toggle Face ID\n"
+    "  '6' - Toggle Face ID Multi\n"
+    "  '7' - Toggle Object Detection\n"
+    "  'a' - Enable All Features\n"
+    "  'd' - Disable All Features\n"
+    "  'r' - Reset to Config File Defaults\n"
+    "  's' - Save Current Settings to Config File\n"
+    "  'b' - Back to Main Menu\n"
+    + "=" * 60 + "\n"
+)
+
+_FACE_ID_MENU_HEADER = (
+    "\n" + "=" * 50 + "\n"
+    "👤 FACE ID MODE\n"
+    + "=" * 50 + "\n"
+    "Current Status:\n"
+)
+
+_FACE_ID_MENU_FOOTER = (
+    "\nCommands:\n"
+    "  'r' - Register Face ID\n"
+    "  'c' - Clear Face ID\n"
+    "  'b' - Back to Main Menu\n"
+    + "=" * 50 + "\n"
+)
+
+# Configuration mode toggle commands -> feature key
+_CFG_TOGGLES = {
+    '1': 'face_detection',
+    '2': 'face_validation',
+    '3': 'person_detection',
+    '4': 'hand_landmarks',
+    '5': 'face_id',
+    '6': 'face_id_multi',
+    '7': 'object_detection',
+}
+
+# Valid commands per menu, checked once before dispatching, and the help shown for anything else
+_MAIN_COMMANDS = frozenset('cmisfux')
+_CFG_COMMANDS = frozenset(_CFG_TOGGLES) | frozenset('adrsb')
+_FACE_ID_COMMANDS = frozenset('rcb')
+
+_MAIN_HELP = "Please use: 'c' (capture), 'm' (metadata), 'i' (image), 's' (settings), 'f' (face ID), 'u' (toggle ULP mode), or 'x' (exit)"
+_CFG_HELP = "Please use valid configuration commands"
+_FACE_ID_HELP = "Please use: 'r' (register), 'c' (clear), or 'b' (back)"
+
+# Features used when config.yaml has no features section (read-only, copied before use)
+_FALLBACK_FEATURES = MappingProxyType({
+    "face_detection": MappingProxyType({"enabled": True}),
+    "face_validation": MappingProxyType({"enabled": False}),
+    "person_detection": MappingProxyType({"enabled": True}),
+    "hand_landmarks": MappingProxyType({"enabled": True}),
+    "face_id": MappingProxyType({"enabled": False}),
+    "face_id_multi": MappingProxyType({"enabled": False}),
+    "object_detection": MappingProxyType({"enabled": False}),
+})
+
 
 def test_prerequisites():
     """Test for required modules and packages"""
     missing_modules = []
     
-    # Required modules
-    required_modules = ['yaml', 'cv2', 'numpy', 'pytest']
+    # Required modules (pytest is only needed to run tests, not the program)
+    required_modules = ['yaml', 'cv2', 'numpy']
     
     for module in required_modules:
-        try:
-            __import__(module)
-        except ImportError:
+        # Already imported modules are present; find_spec only locates the others, it doesn't run their import
+        if module not in sys.modules and find_spec(module) is None:
             missing_modules.append(module)
     
     if missing_modules:
@@ -100,8 +413,7 @@ def run_test_program():
     
     # Load configuration
     try:
-        with open("config.yaml") as f:
-            config = yaml.safe_load(f)
+        config = _load_config("config.yaml")
     except FileNotFoundError:
         print("❌ config.yaml not found. Please ensure the configuration file exists.")
         return
@@ -112,157 +424,141 @@ def run_test_program():
     # Initialize EVE wrapper
     try:
         print("🔧 Initializing EVE SDK...")
+        from eve_wrapper_ext import EveWrapperExt
         
         # Get configuration
         i2c_config = config.get('i2c', {})
         eve_config = config.get('eve', {})
         
-        wrapper = EveWrapperExt(
-            comport=eve_config.get('comport', 0),
-            i2cAdapter=i2c_config.get('bus', 0),
-            i2cDevice=i2c_config.get('device_address', 0x30),
-            i2cIRQ=i2c_config.get('irq_pin', 26),
-            pipelineVersion=eve_config.get('pipeline_version', 0),
-            evePath=eve_config.get('eve_path', '/opt/EVE-6.7.21-Source/bin'),
-            toJpg=eve_config.get('to_jpg', True),
-            copyImage=eve_config.get('copy_image', True),  # Enable image copying for capture
-            maxWidth=eve_config.get('max_width', 800),
-            driverPath=eve_config.get('driver_path', '/home/lattice/mY_Work/eve-cam/clnx_camDrvEn'),
-            objectDetection=eve_config.get('object_detection', False)
-        )
+        sections = {'i2c': i2c_config, 'eve': eve_config}
+        wrapper = EveWrapperExt(**{
+            param: sections[section].get(key, default)
+            for param, (section, key, default) in _WRAPPER_PARAMS.items()
+        })
         
         # Initialize with metadata camera setting from config
         use_metadata_camera = eve_config.get('use_metadata_camera', True)
         wrapper.init(useMetadataCamera=use_metadata_camera)
+        
+        # Re-indent metadata.txt for reading by hand, otherwise the FPGA's JSON is saved as received
+        pretty_metadata = eve_config.get('pretty_metadata', False)
+        # Capture files are written with O_DSYNC when set, e.g. before pulling power on an SD card setup
+        write_capture = functools.partial(_write_file, sync=eve_config.get('sync_writes', False))
         print("✅ EVE SDK initialized successfully")
         
         # Configure features from config
-        features = config.get('features', {
-            "face_detection": {"enabled": True},
-            "face_validation": {"enabled": False},
-            "person_detection": {"enabled": True},
-            "hand_landmarks": {"enabled": True},
-            "face_id": {"enabled": False},
-            "face_id_multi": {"enabled": False},
-            "object_detection": {"enabled": False}
-        })
-        if wrapper.isFpgaEnabled():
+        features = config.get('features')
+        if features is None:
+            features = {name: dict(state) for name, state in _FALLBACK_FEATURES.items()}
+        # Snapshot of the config file's features for reset_to_defaults()
+        default_features = copy.deepcopy(config.get('features') or {})
+        # Fixed once init() has run, so it is read a single time
+        fpga_enabled = wrapper.isFpgaEnabled()
+        if fpga_enabled:
             wrapper.configureFpga(features)
         else:
             wrapper.configure(features)
             
         print("✅ Features configured")
         
+        # Set up the JPEG encoder now so the first capture doesn't pay for it.
+        # Without copy_image there are no raw frames: captures save the SDK's JPEG and never encode.
+        if eve_config.get('copy_image', True):
+            try:
+                _warm_up_jpeg_encoder(eve_config.get('max_width', 800))
+            except Exception:
+                pass
+        
     except Exception as e:
         print(f"❌ Failed to initialize EVE SDK: {e}")
         return
     
     # Helper functions
     def show_menu():
-        print("\n" + "=" * 50)
-        print("📋 INTERACTIVE MENU")
-        print("=" * 50)
-        print("Commands:")
-        print("  'c' - Capture frame (image + metadata)")
-        print("  'm' - Capture metadata only")
-        print("  'i' - Capture image only")
-        print("  's' - Settings/Configuration mode")
-        print("  'f' - Face ID Registration mode")
-        print("  'u' - Toggle ULP mode")        
-        print("  'x' - Exit program")
-        print("=" * 50)
-    
-    def save_metadata(filename="metadata.txt"):
-        """Save current metadata to file"""
+        """Display the main menu and the current status line with a single write"""
+        sys.stdout.write(_MAIN_MENU + get_status_info())
+        sys.stdout.flush()
+    
+    def save_metadata(frame, filename="metadata.txt"):
+        """Save the metadata of a frame snapshot to file, returning (saved, status message)"""
         try:
-            metadata = wrapper.get_json()
-            if metadata:
-                with open(filename, 'w') as f:
-                    json.dump(metadata, f, indent=2)
-                print(f"✅ Metadata saved to {filename}")
-                return True
+            raw_metadata = frame.raw_metadata
+            metadata = frame.metadata
+            # The FPGA already sends JSON: it is written out verbatim, and only re-encoded
+            # (indented) for pretty_metadata or if the raw text is missing
+            if metadata is not None and (pretty_metadata or not raw_metadata):
+                # default=str writes values of unexpected types as strings instead of failing the capture
+                orjson = _orjson()
+                if orjson is not None:
+                    option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC | orjson.OPT_INDENT_2
+                    write_capture(filename, orjson.dumps(metadata, default=str, option=option))
+                else:
+                    write_capture(filename, json.dumps(metadata, default=str, indent=2).encode())
+                return True, f"✅ Metadata saved to {filename}"
+            elif raw_metadata:
+                write_capture(filename, raw_metadata)
+                return True, f"✅ Metadata saved to {filename}"
             else:
-                print("⚠️  No metadata available to save")
-                return False
+                return False, "⚠️  No metadata available to save"
         except Exception as e:
-            print(f"❌ Failed to save metadata: {e}")
-            return False
+            return False, f"❌ Failed to save metadata: {e}"
     
-    def save_image(filename="image.jpg"):
-        """Save current image to file"""
+    def save_image(frame, filename="image.jpg"):
+        """Save the image of a frame snapshot to file, returning (saved, status message)"""
         try:
             # Try to get image array first
-            image_array = wrapper.get_image()
+            image_array = frame.image
             if image_array is not None:
-                cv2.imwrite(filename, image_array)
-                print(f"✅ Image saved to {filename}")
-                return True
+                if filename.lower().endswith(('.jpg', '.jpeg')):
+                    write_capture(filename, _encode_jpeg(image_array))
+                else:
+                    _cv2().imwrite(filename, image_array)
+                return True, f"✅ Image saved to {filename}"
             else:
                 # Try to get JPG data as fallback
-                jpg_data = wrapper.get_image_jpg()
-                if jpg_data:
-                    with open(filename, 'wb') as f:
-                        f.write(jpg_data)
-                    print(f"✅ Image (JPG) saved to {filename}")
-                    return True
+                jpg_data = frame.image_jpg
+                if jpg_data:  # None or empty bytes both mean no JPEG
+                    write_capture(filename, jpg_data)
+                    return True, f"✅ Image (JPG) saved to {filename}"
                 else:
-                    print("⚠️  No image available to save")
-                    return False
+                    return False, "⚠️  No image available to save"
         except Exception as e:
-            print(f"❌ Failed to save image: {e}")
-            return False
+            return False, f"❌ Failed to save image: {e}"
     
     def get_status_info():
-        """Get current system status"""
-        frame_id = wrapper.get_frame_id()
-        fpga_enabled = wrapper.isFpgaEnabled()
-        using_metadata = wrapper.isUsingMetadata()
-        ulp_enabled = wrapper.isUlpEnabled()
+        """Get current system status as a display line"""
+        status = wrapper.get_status_snapshot()
         
-        print(f"📊 Status: Frame ID: {frame_id} | FPGA: {'✅' if fpga_enabled else '❌'} | Metadata Camera: {'✅' if using_metadata else '❌'} | ULP: {'✅' if ulp_enabled else '❌'}")
+        return f"📊 Status: Frame ID: {status.frame_id} | FPGA: {'✅' if status.fpga else '❌'} | Metadata Camera: {'✅' if status.metadata else '❌'} | ULP: {'✅' if status.ulp else '❌'}\n"
     
-    def show_configuration_menu():
-        """Display the configuration menu"""
-        print("\n" + "=" * 60)
-        print("⚙️  CONFIGURATION MODE")
-        print("=" * 60)
-        print("Current Feature Settings:")
+    def show_configuration_menu(refresh_state=True):
+        """Display the configuration menu, reading back the FPGA state first if refresh_state is set"""
+        sys.stdout.write(_CONFIG_MENU_HEADER)
+        sys.stdout.flush()
 
-        time.sleep(0.5)  # slight delay to ensure settings are updated
-        
-        # Poll and update features with actual FPGA state
-        wrapper.querySettings() # recommended before polling
-        
-        time.sleep(0.5)  # slight delay to ensure settings are updated
-        
-        wrapper.poll_settings()
-        actual_state = wrapper.getFpgaState()
-        for feature_name, state in actual_state.items():
-            if feature_name in features:
-                features[feature_name]['enabled'] = state['enabled']
-                if 'max_ips' in state:
-                    features[feature_name]['max_ips'] = state['max_ips']
+        if refresh_state:
+            time.sleep(0.5)  # slight delay to ensure settings are updated
+            
+            # Poll and update features with actual FPGA state
+            wrapper.querySettings() # recommended before polling
+            
+            time.sleep(0.5)  # slight delay to ensure settings are updated
+            
+            wrapper.poll_settings()
+            actual_state = wrapper.getFpgaState()
+            for feature_name, state in actual_state.items():
+                if feature_name in features:
+                    features[feature_name]['enabled'] = state.enabled
+                    if state.max_ips is not None:
+                        features[feature_name]['max_ips'] = state.max_ips
         
         # Display current feature status
-        for feature_name, feature_config in features.items():
-            enabled = feature_config.get('enabled', False)
-            status = "🟢 ON " if enabled else "🔴 OFF"
-            print(f"  {feature_name.replace('_', ' ').title()}: {status}")
-        
-        print("\nConfiguration Options:")
-        print("  '1' - Toggle Face Detection")
-        print("  '2' - Toggle Face Validation")
-        print("  '3' - Toggle Person Detection") 
-        print("  '4' - Toggle Hand Landmarks")
-        print("  '5' - Toggle Face ID")
-        print("  '6' - Toggle Face ID Multi")
-        print("  '7' - Toggle Object Detection")
-        print("  'a' - Enable All Features")
-        print("  'd' - Disable All Features")
-        print("  'r' - Reset to Config File Defaults")
-        print("  's' - Save Current Settings to Config File")
-        print("  'b' - Back to Main Menu")
-        print("=" * 60)
+        status_lines = "".join(
+            f"  {_feature_title(feature_name)}: {'🟢 ON ' if feature_config.get('enabled', False) else '🔴 OFF'}\n"
+            for feature_name, feature_config in features.items()
+        )
+        sys.stdout.write(status_lines + _CONFIG_MENU_FOOTER)
+        sys.stdout.flush()
     
     def toggle_feature(feature_key):
         """Toggle a specific feature on/off"""
@@ -270,7 +566,7 @@ def run_test_program():
             current_state = features[feature_key].get('enabled', False)
             features[feature_key]['enabled'] = not current_state
             new_state = "enabled" if not current_state else "disabled"
-            feature_name = feature_key.replace('_', ' ').title()
+            feature_name = _feature_title(feature_key)
             print(f"✅ {feature_name} {new_state}")
             return True
         return False
@@ -289,72 +585,64 @@ def run_test_program():
     
     def reset_to_defaults():
         """Reset features to config file defaults"""
-        try:
-            with open("config.yaml") as f:
-                default_config = yaml.safe_load(f)
-            
-            default_features = default_config.get('features', {})
-            for feature_key in features:
-                if feature_key in default_features:
-                    features[feature_key]['enabled'] = default_features[feature_key].get('enabled', False)
-            
-            print("✅ Features reset to config file defaults")
-        except Exception as e:
-            print(f"❌ Failed to reset to defaults: {e}")
+        for feature_key in features:
+            if feature_key in default_features:
+                features[feature_key]['enabled'] = default_features[feature_key].get('enabled', False)
+        
+        print("✅ Features reset to config file defaults")
     
     def save_config_to_file():
         """Save current feature settings to config file"""
         try:
-            # Load current config
-            with open("config.yaml") as f:
-                current_config = yaml.safe_load(f)
+            _save_features("config.yaml", features)
             
-            # Update features section
-            current_config['features'] = features
-            
-            # Write back to file
-            with open("config.yaml", 'w') as f:
-                yaml.dump(current_config, f, default_flow_style=False, indent=2)
+            # The saved settings are the new config file defaults
+            default_features.clear()
+            default_features.update(copy.deepcopy(features))
             
             print("✅ Configuration saved to config.yaml")
         except Exception as e:
             print(f"❌ Failed to save configuration: {e}")
     
-    def apply_feature_configuration():
-        """Apply current feature configuration to EVE"""
+    def apply_feature_configuration(changed=None, verify=False):
+        """
+        Apply current feature configuration to EVE, only the `changed` features if given.
+        With verify set, wait for the FPGA to process the settings before returning.
+        """
+        if changed is not None and not changed:
+            return
         try:
             print("🔄 Applying feature configuration...")
             
-            if wrapper.isFpgaEnabled():
-                wrapper.configureFpga(features)
-                # Poll settings to get actual state from FPGA
-                time.sleep(0.5)  # Give FPGA time to process
-                print("✅ Feature configuration applied and verified")
+            if fpga_enabled:
+                if changed is None:
+                    wrapper.configureFpga(features)
+                else:
+                    wrapper.configureFpgaDelta(features, changed)
+                if verify:
+                    time.sleep(0.5)  # Give FPGA time to process
+                    print("✅ Feature configuration applied and verified")
+                else:
+                    print("✅ Feature configuration sent")
             else:
-                wrapper.configure(features)
+                wrapper.configure(features if changed is None else {feature_key: features[feature_key] for feature_key in changed})
                 print("✅ Feature configuration applied successfully")
         except Exception as e:
             print(f"❌ Failed to apply configuration: {e}")
     
     def show_face_id_menu():
         """Display the Face ID registration menu"""
-        print("\n" + "=" * 50)
-        print("👤 FACE ID MODE")
-        print("=" * 50)
-        
         # Check current Face ID status
         face_id_enabled = features.get('face_id', {}).get('enabled', False)
         face_id_multi_enabled = features.get('face_id_multi', {}).get('enabled', False)
         
-        print("Current Status:")
-        print(f"  Face ID: {'🟢 ENABLED' if face_id_enabled else '🔴 DISABLED'}")
-        print(f"  Multi Face ID: {'🟢 ENABLED' if face_id_multi_enabled else '🔴 DISABLED'}")
-        
-        print("\nCommands:")
-        print("  'r' - Register Face ID")
-        print("  'c' - Clear Face ID")
-        print("  'b' - Back to Main Menu")
-        print("=" * 50)
+        sys.stdout.write(
+            _FACE_ID_MENU_HEADER
+            + f"  Face ID: {'🟢 ENABLED' if face_id_enabled else '🔴 DISABLED'}\n"
+            + f"  Multi Face ID: {'🟢 ENABLED' if face_id_multi_enabled else '🔴 DISABLED'}\n"
+            + _FACE_ID_MENU_FOOTER
+        )
+        sys.stdout.flush()
     
     def register_face_id():
         """Register a new Face ID"""
@@ -389,6 +677,12 @@ def run_test_program():
                 print("\nEnter Face ID command: ", end="", flush=True)
                 cmd = input().strip().lower()
                 
+                if cmd not in _FACE_ID_COMMANDS:
+                    if cmd:
+                        print(f"❌ Unknown command: '{cmd}'")
+                        print(_FACE_ID_HELP)
+                    continue
+                
                 if cmd == 'r':
                     register_face_id()
                 elif cmd == 'c':
@@ -396,11 +690,6 @@ def run_test_program():
                 elif cmd == 'b':
                     print("🔙 Returning to main menu...")
                     break
-                elif cmd == '':
-                    continue
-                else:
-                    print(f"❌ Unknown command: '{cmd}'")
-                    print("Please use: 'r' (register), 'c' (clear), or 'b' (back)")
                     
             except KeyboardInterrupt:
                 print("\n🔙 Returning to main menu...")
@@ -409,55 +698,48 @@ def run_test_program():
                 print("\n🔙 End of input detected, returning to main menu...")
                 break
     
+    def run_bulk_update(action):
+        """Run a bulk feature update and return the names of the features it changed"""
+        before = {feature_key: state.get('enabled') for feature_key, state in features.items()}
+        action()
+        return {feature_key for feature_key, state in features.items() if state.get('enabled') != before[feature_key]}
+    
+    bulk_commands = {
+        'a': enable_all_features,
+        'd': disable_all_features,
+        'r': reset_to_defaults,
+    }
+    
     def run_configuration_mode():
         """Run the interactive configuration mode"""
+        # Read the FPGA state back on entry and after bulk changes; single toggles trust the write
+        refresh_state = True
         while True:
-            show_configuration_menu()
+            show_configuration_menu(refresh_state)
+            refresh_state = False
             
             try:
                 print("\nEnter configuration command: ", end="", flush=True)
                 cmd = input().strip().lower()
                 
-                if cmd == '1':
-                    toggle_feature('face_detection')
-                    apply_feature_configuration()
-                elif cmd == '2':
-                    toggle_feature('face_validation')
-                    apply_feature_configuration()
-                elif cmd == '3':
-                    toggle_feature('person_detection')
-                    apply_feature_configuration()
-                elif cmd == '4':
-                    toggle_feature('hand_landmarks')
-                    apply_feature_configuration()
-                elif cmd == '5':
-                    toggle_feature('face_id')
-                    apply_feature_configuration()
-                elif cmd == '6':
-                    toggle_feature('face_id_multi')
-                    apply_feature_configuration()
-                elif cmd == '7':
-                    toggle_feature('object_detection')
-                    apply_feature_configuration()
-                elif cmd == 'a':
-                    enable_all_features()
-                    apply_feature_configuration()
-                elif cmd == 'd':
-                    disable_all_features()
-                    apply_feature_configuration()
-                elif cmd == 'r':
-                    reset_to_defaults()
-                    apply_feature_configuration()
+                if cmd not in _CFG_COMMANDS:
+                    if cmd:
+                        print(f"❌ Unknown command: '{cmd}'")
+                        print(_CFG_HELP)
+                    continue
+                
+                feature_key = _CFG_TOGGLES.get(cmd)
+                if feature_key is not None:
+                    if toggle_feature(feature_key):
+                        apply_feature_configuration({feature_key})
+                elif cmd in bulk_commands:
+                    apply_feature_configuration(run_bulk_update(bulk_commands[cmd]), verify=True)
+                    refresh_state = True
                 elif cmd == 's':
                     save_config_to_file()
                 elif cmd == 'b':
                     print("🔙 Returning to main menu...")
                     break
-                elif cmd == '':
-                    continue
-                else:
-                    print(f"❌ Unknown command: '{cmd}'")
-                    print("Please use valid configuration commands")
                     
             except KeyboardInterrupt:
                 print("\n🔙 Returning to main menu...")
@@ -491,14 +773,18 @@ def run_test_program():
             else:
                 print(f"⚠️  ULP enable result: {result}")
     
+    # The metadata write and the JPEG encode/write of a capture run side by side here
+    io_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="capture")
+    
     # Main program loop
     try:
+        redraw = True
         while True:
             
-            show_menu()
-            
-            # Show current status
-            get_status_info()
+            # Only redraw the menu and re-read the status after a command ran
+            if redraw:
+                show_menu()
+            redraw = True
             
             # Get user input
             try:
@@ -506,13 +792,26 @@ def run_test_program():
                 print("\nEnter command (c/m/i/s/f/u/x): ", end="", flush=True)
                 command = input().strip().lower()
                 
+                if command not in _MAIN_COMMANDS:
+                    if command:
+                        print(f"\n❌ Unknown command: '{command}'")
+                        print(_MAIN_HELP)
+                    else:
+                        # Empty input, just prompt again
+                        redraw = False
+                    continue
+                
                 if command == 'c':
                     print("\n🔄 Capturing frame (image + metadata)...")
-                    # Allow some time for frame capture
-                    time.sleep(0.1)
+                    # Both files come from the same frame, the next one if it arrives within 100 ms
+                    frame = wrapper.wait_for_next_frame(0.1)
                     
-                    saved_metadata = save_metadata("metadata.txt")
-                    saved_image = save_image("image.jpg")
+                    metadata_future = io_pool.submit(save_metadata, frame, "metadata.txt")
+                    image_future = io_pool.submit(save_image, frame, "image.jpg")
+                    (saved_metadata, metadata_message), (saved_image, image_message) = metadata_future.result(), image_future.result()
+                    # The workers don't print, so their messages can't interleave
+                    print(metadata_message)
+                    print(image_message)
                     
                     if saved_metadata and saved_image:
                         print("🎉 Frame capture completed!")
@@ -523,13 +822,11 @@ def run_test_program():
                 
                 elif command == 'm':
                     print("\n🔄 Capturing metadata...")
-                    time.sleep(0.1)
-                    save_metadata("metadata.txt")
+                    print(save_metadata(wrapper.wait_for_next_frame(0.1), "metadata.txt")[1])
                 
                 elif command == 'i':
                     print("\n🔄 Capturing image...")
-                    time.sleep(0.1)
-                    save_image("image.jpg")
+                    print(save_image(wrapper.wait_for_next_frame(0.1), "image.jpg")[1])
                 
                 elif command == 's':
                     print("\n⚙️  Entering configuration mode...")
@@ -546,14 +843,6 @@ def run_test_program():
                 elif command == 'x':
                     print("\n👋 Exiting program...")
                     break
-                
-                elif command == '':
-                    # Empty input, just continue
-                    continue
-                    
-                else:
-                    print(f"\n❌ Unknown command: '{command}'")
-                    print("Please use: 'c' (capture), 'm' (metadata), 'i' (image), 's' (settings), 'f' (face ID), 'u' (toggle ULP mode), or 'x' (exit)")
                     
             except KeyboardInterrupt:
                 print("\n\n⏹️  Program interrupted by user (Ctrl+C)")
@@ -569,6 +858,7 @@ def run_test_program():
         # Cleanup
         try:
             print("\n🧹 Cleaning up...")
+            io_pool.shutdown(wait=True)
             wrapper.stop()
             print("✅ EVE SDK stopped successfully")
         except Exception as e:
@@ -0,0 +1,118 @@
+"""
+Tests for the eve_structs_ext fast paths, checked against plain ctypes attribute reads.
+No hardware is needed: the structures are populated from Python.
+"""
+
+import ctypes
+
+import numpy as np
+
+from eve.eve_python import eve_sdk as sdk
+import eve_structs_ext as ext
+
+
+def make_hand_detections(count=2):
+    """Build an EveHandDetections with `count` hands and distinct, float32-exact values in every field"""
+    detections = sdk.structs.EveHandDetections()
+    detections.status = 3
+    detections.hasFaceROI = 1
+    detections.faceROI.x, detections.faceROI.y = 1.5, 2.5
+    detections.faceROI.width, detections.faceROI.height = 30.0, 40.0
+    detections.detectedHandCount = count
+    for i in range(sdk.structs.EVE_MAX_HAND_DETECTIONS):
+        hand = detections.hands[i]
+        hand.id = i + 1
+        hand.boundingBox.x, hand.boundingBox.y = 10 * i, 20 * i
+        hand.boundingBox.width, hand.boundingBox.height = 100 + i, 200 + i
+        hand.boundingBoxScore = 0.5 + i
+        for j in range(sdk.structs.EVE_HAND_LANDMARK_SIZE):
+            hand.landmarksICS[j].x = i * 100 + j + 0.25
+            hand.landmarksICS[j].y = i * 100 + j + 0.75
+        hand.validationScore = 0.125 * (i + 1)
+        hand.inPlaneAngle = -1.5 * i
+        hand.depth = 2.0 + i
+        hand.isMainUserHand = int(i == 0)
+        hand.isInCurrentFrame = 1
+    return detections
+
+
+def assert_hand_matches(record, hand):
+    """Compare a fast-path hand record with the ctypes EveSingleHandDetection it was read from"""
+    assert record.id == hand.id
+    assert record.boundingBox == (hand.boundingBox.x, hand.boundingBox.y, hand.boundingBox.width, hand.boundingBox.height)
+    assert record.boundingBoxScore == hand.boundingBoxScore
+    assert record.landmarksICS == tuple(value for point in hand.landmarksICS for value in (point.x, point.y))
+    assert record.validationScore == hand.validationScore
+    assert record.inPlaneAngle == hand.inPlaneAngle
+    assert record.depth == hand.depth
+    assert record.isMainUserHand == hand.isMainUserHand
+    assert record.isInCurrentFrame == hand.isInCurrentFrame
+
+
+def test_parse_hand_detections_matches_ctypes():
+    detections = make_hand_detections(count=2)
+    parsed = ext.parse_hand_detections(bytes(detections))
+
+    assert parsed.status == detections.status
+    assert parsed.hasFaceROI == detections.hasFaceROI
+    assert parsed.faceROI == (detections.faceROI.x, detections.faceROI.y, detections.faceROI.width, detections.faceROI.height)
+    assert parsed.detectedHandCount == 2
+    assert len(parsed.hands) == 2
+    for record, hand in zip(parsed.hands, detections.hands):
+        assert_hand_matches(record, hand)
+
+
+def test_parse_hand_detections_offset_and_count_clamp():
+    detections = make_hand_detections(count=sdk.structs.EVE_MAX_HAND_DETECTIONS + 5)
+    parsed = ext.parse_hand_detections(b"\0" * 16 + bytes(detections), offset=16)
+
+    assert len(parsed.hands) == sdk.structs.EVE_MAX_HAND_DETECTIONS
+    assert_hand_matches(parsed.hands[-1], detections.hands[sdk.structs.EVE_MAX_HAND_DETECTIONS - 1])
+
+
+def test_iter_hands_fast_snapshots_the_struct():
+    detections = make_hand_detections(count=3)
+    hands = ext.iter_hands_fast(detections)
+    first = next(hands)
+    # The structure is copied when iteration starts, later writes must not show up
+    detections.hands[1].id = 99
+    rest = list(hands)
+
+    assert_hand_matches(first, detections.hands[0])
+    assert [record.id for record in rest] == [2, 3]
+
+
+def test_landmarks_array_values_and_aliasing():
+    detections = make_hand_detections(count=2)
+    landmarks = ext.landmarks_array(detections)
+
+    assert landmarks.shape == (2, sdk.structs.EVE_HAND_LANDMARK_SIZE, 2)
+    assert landmarks.dtype == np.float32
+    for i in range(2):
+        for j in range(sdk.structs.EVE_HAND_LANDMARK_SIZE):
+            point = detections.hands[i].landmarksICS[j]
+            assert tuple(landmarks[i, j]) == (point.x, point.y)
+
+    # Zero-copy: the array and the struct share memory in both directions
+    hand_offset = type(detections).hands.offset
+    landmarks_offset = sdk.structs.EveSingleHandDetection.landmarksICS.offset
+    assert landmarks.ctypes.data == ctypes.addressof(detections) + hand_offset + landmarks_offset
+    detections.hands[1].landmarksICS[4].y = 123.5
+    assert landmarks[1, 4, 1] == 123.5
+    landmarks[0, 2, 0] = -7.0
+    assert detections.hands[0].landmarksICS[2].x == -7.0
+
+
+def test_camera_format_round_trip():
+    packed = ext.pack_camera_format(1280, 720, 3, 29.5, 1, 2)
+    camera_format = sdk.structs.CCameraFormat.from_buffer_copy(packed)
+
+    assert len(packed) == ctypes.sizeof(sdk.structs.CCameraFormat)
+    assert (camera_format.resolution.width, camera_format.resolution.height) == (1280, 720)
+    assert (camera_format.format, camera_format.fps) == (3, 29.5)
+    assert (camera_format.compareResolution, camera_format.compareFps) == (1, 2)
+    assert ext.unpack_camera_format(bytes(camera_format)) == (1280, 720, 3, 29.5, 1, 2)
+
+    target = sdk.structs.CCameraFormat()
+    assert ext.unpack_camera_format_into(target, b"\xff" * 4 + packed, offset=4) is target
+    assert bytes(target) == packed
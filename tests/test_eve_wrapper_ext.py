@@ -0,0 +1,76 @@
+"""
+Tests for the EveWrapperExt helpers that work on already received frames and FPGA state.
+The wrapper is created without running EveWrapper.__init__, so no SDK or hardware is needed.
+"""
+
+import numpy as np
+import pytest
+
+import eve.eve_wrapper as eve_wrapper
+from eve_wrapper_ext import EveWrapperExt, FeatureState, FpgaState, FrameSnapshot
+
+
+def wrapper_with_image(image):
+    """An EveWrapperExt whose latest published frame holds `image`"""
+    wrapper = EveWrapperExt.__new__(EveWrapperExt)
+    wrapper._snapshot = FrameSnapshot(1, None, None, image, None)
+    return wrapper
+
+
+def test_get_image_into_copies_into_the_buffer():
+    image = np.arange(4 * 5 * 3, dtype=np.uint8).reshape(4, 5, 3)
+    out = np.zeros((8, 10, 3), np.uint8)
+
+    view = wrapper_with_image(image).get_image_into(out)
+
+    assert view.shape == image.shape
+    assert np.shares_memory(view, out)
+    assert np.array_equal(view, image)
+    assert not out[4:].any() and not out[:, 5:].any()
+
+
+def test_get_image_into_without_image():
+    assert wrapper_with_image(None).get_image_into(np.zeros((8, 10, 3), np.uint8)) is None
+
+
+@pytest.mark.parametrize("image, out", [
+    # A grey frame must not be broadcast into a 3-channel buffer
+    (np.zeros((4, 5, 1), np.uint8), np.zeros((8, 10, 3), np.uint8)),
+    (np.zeros((4, 5, 3), np.uint8), np.zeros((8, 10, 3), np.float32)),
+    (np.zeros((4, 5, 3), np.uint8), np.zeros((3, 10, 3), np.uint8)),
+])
+def test_get_image_into_rejects_mismatched_buffers(image, out):
+    with pytest.raises(ValueError):
+        wrapper_with_image(image).get_image_into(out)
+
+
+def test_fpga_state_to_dict_matches_the_old_layout():
+    state = FpgaState(
+        face_detection=FeatureState(True, 15),
+        face_validation=FeatureState(False, None),
+        face_id=None,
+        person_detection=None,
+        hand_landmarks=FeatureState(True, None),
+    )
+
+    assert state.to_dict() == {
+        "face_detection": {"enabled": True, "max_ips": 15},
+        "face_validation": {"enabled": False},
+        "hand_landmarks": {"enabled": True},
+    }
+
+
+def test_get_status_snapshot_uses_the_base_getters(monkeypatch):
+    wrapper = EveWrapperExt.__new__(EveWrapperExt)
+    wrapper._frame_id = 7
+    wrapper._fpga_enabled = True
+    wrapper._metaDataFpgaCameraId = wrapper._usedCameraId = 1
+    wrapper._ulpActivated = False
+
+    monkeypatch.setattr(eve_wrapper, "eve_sdk", None)
+    assert wrapper.get_status_snapshot() == (7, False, False, False)
+
+    monkeypatch.setattr(eve_wrapper, "eve_sdk", object())
+    status = wrapper.get_status_snapshot()
+    assert status == (wrapper.get_frame_id(), wrapper.isFpgaEnabled(), wrapper.isUsingMetadata(), wrapper.isUlpEnabled())
+    assert status == (7, True, True, False)
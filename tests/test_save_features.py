@@ -0,0 +1,91 @@
+"""
+Tests for tapp._save_features(), which splices the features block into the user's config.yaml.
+"""
+
+import yaml
+
+import tapp
+
+
+HEADER = """\
+# EVE test configuration
+i2c:
+  bus: 0  # keep this comment
+  device_address: 0x30
+
+eve:
+  comport: 0
+  eve_path: '/opt/EVE-6.7.3-Source/bin'
+
+# BEGIN features (rewritten by tapp.py when settings are saved, keep both marker lines)
+"""
+
+OLD_BLOCK = """\
+features:
+  face_detection:
+    enabled: true
+  hand_landmarks:
+    enabled: false
+"""
+
+FOOTER = """\
+# END features
+
+# Trailing notes stay where they are
+extra:
+  value: 1
+"""
+
+FEATURES = {
+    "face_detection": {"enabled": False},
+    "hand_landmarks": {"enabled": True, "max_ips": 15},
+    "face_id": {"enabled": True},
+}
+
+
+def test_save_features_only_rewrites_between_markers(tmp_path):
+    path = tmp_path / "config.yaml"
+    path.write_text(HEADER + OLD_BLOCK + FOOTER)
+
+    tapp._save_features(str(path), FEATURES)
+
+    text = path.read_text()
+    assert text.startswith(HEADER)
+    assert text.endswith(FOOTER)
+    assert OLD_BLOCK not in text
+    block = text[len(HEADER):len(text) - len(FOOTER)]
+    assert yaml.safe_load(block) == {"features": FEATURES}
+
+
+def test_save_features_adds_markers_when_missing(tmp_path):
+    path = tmp_path / "config.yaml"
+    path.write_text(HEADER.replace(tapp._FEATURES_BEGIN, "# no markers yet") + OLD_BLOCK)
+
+    tapp._save_features(str(path), FEATURES)
+
+    text = path.read_text()
+    assert text.count(tapp._FEATURES_BEGIN) == 1
+    assert text.count(tapp._FEATURES_END) == 1
+    assert text.index(tapp._FEATURES_BEGIN) < text.index("features:") < text.index(tapp._FEATURES_END)
+    config = yaml.safe_load(text)
+    assert config["i2c"] == {"bus": 0, "device_address": 0x30}
+    assert config["eve"] == {"comport": 0, "eve_path": "/opt/EVE-6.7.3-Source/bin"}
+
+    # Once the markers exist, later saves splice instead of rewriting the file
+    tapp._save_features(str(path), {"face_detection": {"enabled": True}})
+    assert path.read_text().startswith(text[:text.index(tapp._FEATURES_BEGIN)])
+
+
+def test_save_features_result_reparses_to_saved_features(tmp_path):
+    path = tmp_path / "config.yaml"
+    path.write_text(HEADER + OLD_BLOCK + FOOTER)
+
+    tapp._save_features(str(path), FEATURES)
+    saved = path.read_text()
+    config = yaml.safe_load(saved)
+
+    assert config["features"] == FEATURES
+    assert config["extra"] == {"value": 1}
+    # Saving the same features again leaves the file byte-identical
+    tapp._save_features(str(path), FEATURES)
+    assert path.read_text() == saved